@@ -3,6 +3,7 @@
 from concurrent import futures
 import socket
 import sys
+import threading
 import time
 import traceback
 import github
@@ -13,6 +14,44 @@ from repo_extractor import conf, schema, utils
 CLR = "\x1b[K"
 TAB = " " * 4
 
+# minimum amount of seconds between redraws of the mining progress line
+PROGRESS_INTERVAL = 0.5
+
+# minimum amount of seconds between progress lines when stdout is not a
+# terminal, e.g. when it is redirected to a log file
+LOG_PROGRESS_INTERVAL = 60
+
+# amount of seconds between updates of the rate limit countdown
+COUNTDOWN_INTERVAL = 30
+
+
+class PooledHTTPSConnection(github.Requester.HTTPSRequestsConnectionClass):
+    """
+    HTTPS connection for PyGithub which shares one pool of connections.
+
+    By default, PyGithub reuses a single connection object per session
+    and stores each request on it before sending it, so two threads
+    making calls at the same time can send each other's requests. A
+    connection object is created per request instead and every one of
+    them is handed the same requests.Session, so TLS connections are
+    still pooled and reused.
+    """
+
+    __sessions: dict = {}
+    __sessions_lock = threading.Lock()
+
+    def __init__(self, host: str, *args, **kwargs) -> None:
+        """
+        Initialize a connection which uses the shared session for host.
+
+        Args:
+            host (str): host to connect to, e.g. "api.github.com".
+        """
+        super().__init__(host, *args, **kwargs)
+
+        with self.__sessions_lock:
+            self.session = self.__sessions.setdefault(host, self.session)
+
 
 class GithubSession:
     """Functionality for verified connections to the GitHub API."""
@@ -25,8 +64,10 @@ class GithubSession:
         Initialize GitHub session object.
 
         Notes:
-            paginated lists are set to return 30 items per page
-                by default. See
+            paginated lists are set to return 100 items per page,
+                the maximum GitHub allows, instead of the default 30.
+                This cuts the amount of page requests made while
+                iterating over issues by about a factor of three. See
                 https://docs.github.com/en/rest/overview/resources-in-the-rest-api#pagination
                 for more information.
 
@@ -39,9 +80,14 @@ class GithubSession:
                 lists.
             session (github.Github): object containing connection to
                 GitHub.
+            sleep_lock (threading.Lock): held by the thread waiting out
+                a rate limit on this session.
+            limit_waits (int): number of rate limits waited out so far.
         """
-        self.__page_len: int = 30
+        self.__page_len: int = 100
         self.session = self.__get_gh_session(auth_path)
+        self.sleep_lock = threading.Lock()
+        self.limit_waits: int = 0
 
     def __get_gh_session(self, auth_path: str) -> github.Github:
         """
@@ -65,6 +111,11 @@ class GithubSession:
         # retrieve token from auth file
         token = utils.read_file_line(auth_path)
 
+        # make concurrent calls from the extractor's threads safe
+        github.Requester.Requester.injectConnectionClasses(
+            github.Requester.HTTPRequestsConnectionClass, PooledHTTPSConnection
+        )
+
         # establish a session with token
         session = github.Github(
             token, per_page=self.__page_len, retry=100, timeout=100
@@ -129,8 +180,21 @@ class Extractor:
             issues_paged_list (github.PaginatedList of github.Issue): the
                 paginated list containing all issues of the chosen type
                 for the repository.
+            page_cache (dict[int, futures.Future]): pages of the
+                paginated list fetched, or being fetched, while locating
+                the mining range.
+            page_lock (threading.Lock): guards page_cache.
+            last_progress (float): monotonic time the mining progress
+                line was last drawn at.
+            stop_event (threading.Event): set when mining is terminated
+                so that getters still running in worker threads stop
+                making calls.
         """
         self.cfg = cfg_obj
+        self.page_cache: dict[int, futures.Future] = {}
+        self.page_lock = threading.Lock()
+        self.last_progress: float = 0.0
+        self.stop_event = threading.Event()
 
         # initialize authenticated GitHub session so that we can
         # interact with the API
@@ -151,20 +215,18 @@ class Extractor:
         """
         job_repo = self.cfg.get_cfg_val("repo")
 
-        while True:
-            try:
-                repo_obj = self.gh_sesh.session.get_repo(job_repo)
-
-            except github.RateLimitExceededException:
-                self.__sleep_extractor()
+        try:
+            repo_obj = self.__retry_on_rate_limit(
+                self.gh_sesh.session.get_repo, job_repo
+            )
 
-            except github.UnknownObjectException:
-                print(f'{TAB}Cannot access "{job_repo}"!')
-                print(f"{TAB}It either does not exist or is private!")
-                sys.exit(1)
+        except github.UnknownObjectException:
+            print(f'{TAB}Cannot access "{job_repo}"!')
+            print(f"{TAB}It either does not exist or is private!")
+            sys.exit(1)
 
-            else:
-                return repo_obj
+        else:
+            return repo_obj
 
     def __get_issues_paged_list(self, repo_obj, state: str):
         """
@@ -185,17 +247,9 @@ class Extractor:
         Returns:
             github.PaginatedList of github.Issue.
         """
-        while True:
-            try:
-                issues_paged_list = repo_obj.get_issues(
-                    direction="asc", sort="created", state=state
-                )
-
-            except github.RateLimitExceededException:
-                self.__sleep_extractor()
-
-            else:
-                return issues_paged_list
+        return self.__retry_on_rate_limit(
+            repo_obj.get_issues, direction="asc", sort="created", state=state
+        )
 
     def __get_sanitized_cfg_range(self) -> tuple[int, int]:
         """
@@ -215,7 +269,9 @@ class Extractor:
 
         num_items: int = self.paged_list.totalCount - 1
         last_page_index: int = num_items // self.gh_sesh.get_pg_len()
-        last_page = self.paged_list.get_page(last_page_index)
+        last_page = self.__retry_on_rate_limit(
+            self.__get_page, last_page_index
+        )
         last_item_num: int = last_page[-1].number
 
         print(f"{TAB * 2}Last item: #{last_item_num}")
@@ -261,7 +317,125 @@ class Extractor:
         # "body": cmd_tbl["body"](cur_PR)
         return {field: cmd_tbl[field](cur_item) for field in fields}
 
-    def __sleep_extractor(self) -> None:
+    def __get_page(self, page_index: int) -> list:
+        """
+        Get a page of the paginated issue list, fetching it only once.
+
+        Finding the range to mine probes the same pages repeatedly,
+        e.g. both binary searches start at the same midpoint and the
+        last page is read when sanitizing the range, so fetched pages
+        are kept for the lifetime of the extractor. The searches run in
+        separate threads, so a page that is already being fetched is
+        waited on rather than requested a second time.
+
+        Args:
+            page_index (int): index of the desired page.
+
+        Raises:
+            github.RateLimitExceededException: the page could not be
+                fetched. It is dropped from the cache so that the
+                next caller tries again.
+
+        Returns:
+            list: issues on the page.
+        """
+        with self.page_lock:
+            page_future = self.page_cache.get(page_index)
+            is_fetcher = page_future is None
+
+            if is_fetcher:
+                page_future = futures.Future()
+                self.page_cache[page_index] = page_future
+
+        if is_fetcher:
+            try:
+                page_future.set_result(self.paged_list.get_page(page_index))
+
+            except Exception as exc:
+                with self.page_lock:
+                    del self.page_cache[page_index]
+
+                page_future.set_exception(exc)
+                raise
+
+        return page_future.result()
+
+    def __print_progress(self, issue_num: int, force: bool = False) -> None:
+        """
+        Redraw the mining progress line.
+
+        Redrawing for every issue costs a terminal write each time, so
+        updates within PROGRESS_INTERVAL of the last one are skipped.
+        The line is redrawn in place with "\r", which only makes sense
+        on a terminal. When output is redirected, a plain line is
+        printed every LOG_PROGRESS_INTERVAL instead.
+
+        Args:
+            issue_num (int): number of the issue last mined.
+            force (bool): draw even if the line was drawn within the
+                interval, e.g. to show the last issue mined.
+        """
+        now: float = time.monotonic()
+        is_tty: bool = sys.stdout.isatty()
+        interval: float = (
+            PROGRESS_INTERVAL if is_tty else LOG_PROGRESS_INTERVAL
+        )
+
+        if not force and now - self.last_progress < interval:
+            return
+
+        self.last_progress = now
+
+        print(
+            f"{CLR}{TAB * 2}Issue: {issue_num}, "
+            f"calls: {self.gh_sesh.get_remaining_calls()}",
+            end="\r" if is_tty else "\n",
+        )
+
+    def __retry_on_rate_limit(self, func, *args, on_limit=None, **kwargs):
+        """
+        Call the given function until it is not rate limited.
+
+        Only one thread waits out a rate limit at a time. Other threads
+        which are rate limited meanwhile wait for it to finish and then
+        call their function again.
+
+        Args:
+            func (Callable): function which makes calls to the GitHub
+                REST API.
+            *args: positional arguments to pass to func.
+            on_limit (Callable): called with no arguments before
+                sleeping, e.g. to write out gathered data.
+            **kwargs: keyword arguments to pass to func.
+
+        Raises:
+            github.RateLimitExceededException: if rate limited
+                by the GitHub REST API, sleep the program until
+                calls can be made again and call func again.
+
+        Returns:
+            the return value of func.
+        """
+        while True:
+            limit_waits: int = self.gh_sesh.limit_waits
+
+            try:
+                return func(*args, **kwargs)
+
+            except github.RateLimitExceededException as exc:
+                with self.gh_sesh.sleep_lock:
+                    # another thread has waited out the limit since func
+                    # was called, so call it again without sleeping
+                    if self.gh_sesh.limit_waits != limit_waits:
+                        continue
+
+                    if on_limit is not None:
+                        on_limit()
+
+                    self.__sleep_extractor(exc.headers)
+                    self.gh_sesh.limit_waits += 1
+
+    def __sleep_extractor(self, headers: dict | None = None) -> None:
         """
         Sleep until the rate limint on our Github account expires.
 
@@ -269,11 +443,39 @@ class Extractor:
             - If your system clock is inaccurate, this method cannot
               give an accurate amount of time until limit reset. Please
               check your system clock.
+
+        Args:
+            headers (dict): headers of the rate limited response, if
+                any. When GitHub sends a "retry-after" header, e.g. for
+                secondary rate limits, we only wait that long. Otherwise,
+                the reset time sent with the response is used.
         """
         print()
 
-        rate_limit = self.gh_sesh.get_remaining_ratelimit_time()
-        while rate_limit > 0:
+        rate_limit: int
+        if headers and "retry-after" in headers:
+            rate_limit = int(headers["retry-after"])
+        elif headers and "x-ratelimit-reset" in headers:
+            rate_limit = int(headers["x-ratelimit-reset"]) - int(time.time())
+        else:
+            rate_limit = self.gh_sesh.get_remaining_ratelimit_time()
+
+        # the countdown is redrawn in place, which only makes sense on a
+        # terminal. When output is redirected, say once how long the wait
+        # is so that a log does not show an unexplained stall
+        is_tty: bool = sys.stdout.isatty()
+
+        if not is_tty and rate_limit > 0:
+            reset_time = time.strftime(
+                "%I:%M:%S %p", time.localtime(time.time() + rate_limit)
+            )
+            print(f"{TAB}Rate limited for {rate_limit}s, until {reset_time}")
+
+        # sleep in long stretches towards a fixed deadline rather than
+        # waking every second to redraw the countdown. The monotonic
+        # clock keeps the deadline from drifting over a long wait
+        end_time: float = time.monotonic() + rate_limit
+        while (rate_limit := int(end_time - time.monotonic())) > 0:
 
             # modulo function returns time tuple
             minutes, seconds = divmod(rate_limit, 60)
@@ -281,13 +483,13 @@ class Extractor:
             # format the time string before printing
             cntdown_str = f"{minutes:02d}:{seconds:02d}"
 
-            print(
-                f"{CLR}{TAB}Time until limit reset: {cntdown_str}",
-                end="\r",
-            )
+            if is_tty:
+                print(
+                    f"{CLR}{TAB}Time until limit reset: {cntdown_str}",
+                    end="\r",
+                )
 
-            time.sleep(1)
-            rate_limit -= 1
+            time.sleep(min(rate_limit, COUNTDOWN_INTERVAL))
 
         while True:
             try:
@@ -296,8 +498,9 @@ class Extractor:
             except github.RateLimitExceededException:
                 print(
                     f"{CLR}{TAB}Waiting for rate limit to lift...",
-                    end="\r",
+                    end="\r" if is_tty else "\n",
                 )
+
                 time.sleep(10)
 
             else:
@@ -334,6 +537,14 @@ class Extractor:
             "comments": self.__get_issue_comments,
         }.items()
 
+        # resolve the getters the user asked for and their fields once
+        # instead of querying the configuration for every issue
+        getters: list = [
+            (func, self.cfg.get_cfg_val(key), schema.cmd_tbl[key])
+            for key, func in func_schema
+            if self.cfg.get_cfg_val(key)
+        ]
+
         out_data: dict = {}
         output_file: str = self.cfg.get_cfg_val("output_path")
         issue_range: list = self.cfg.get_cfg_val("range")
@@ -346,51 +557,84 @@ class Extractor:
         # ends are exclusive. To make it end-inclusive, we add 1
         repo_slice = self.paged_list[start_index: end_index + 1]
 
-        print(f"{TAB}Starting mining at #{issue_range[0]}...")
-
-        for cur_issue in repo_slice:
+        def mine_issue(cur_issue) -> dict:
             cur_issue_data: dict = {}
 
-            try:
-                for key, func in func_schema:
-                    if self.cfg.get_cfg_val(key):
-                        cur_issue_data |= func(
-                            self.cfg.get_cfg_val(key),
-                            schema.cmd_tbl[key],
-                            cur_issue,
-                        )
+            jobs: list = [
+                executor.submit(func, fields, cmd_tbl, cur_issue)
+                for func, fields, cmd_tbl in getters
+            ]
 
-                cur_issue_entry: dict = {str(cur_issue.number): cur_issue_data}
+            # a getter that fails is raised as soon as it fails rather than
+            # after the getters before it have finished their walks, so
+            # that termination can stop those walks
+            done, not_done = futures.wait(
+                jobs, return_when=futures.FIRST_EXCEPTION
+            )
 
-            except github.RateLimitExceededException:
-                utils.write_merged_dict_to_jsonfile(out_data, output_file)
+            if not_done:
+                for job in done:
+                    if (exc := job.exception()) is not None:
+                        raise exc
 
-                # clear dictionary so that it isn't massive and holding
-                # onto data that we have already written to output
-                out_data.clear()
-                print()
-                self.__sleep_extractor()
+            # collect results in schema order so output key order is
+            # the same as when the getters ran one after another
+            for job in jobs:
+                cur_issue_data |= job.result()
 
-            except (
-                KeyboardInterrupt,
-                github.GithubException,
-                socket.error,
-                socket.gaierror,
-            ):
+            return cur_issue_data
 
-                print("\nWriting gathered data...")
-                utils.write_merged_dict_to_jsonfile(out_data, output_file)
+        def write_out_data() -> None:
+            utils.write_merged_dict_to_jsonfile(out_data, output_file)
 
-                print(f"{TAB}Terminating at item #{cur_issue.number}\n")
-                print("---------------------------------------------\n\n")
-                traceback.print_exc()
-                sys.exit(1)
+            # clear dictionary so that it isn't massive and holding
+            # onto data that we have already written to output
+            out_data.clear()
 
-            else:
-                out_data |= cur_issue_entry
+        print(f"{TAB}Starting mining at #{issue_range[0]}...")
+
+        cur_issue = None
+
+        # comments and commits come from separate endpoints with no data
+        # dependency, so each issue's getters are run concurrently
+        with futures.ThreadPoolExecutor(
+            max_workers=len(func_schema)
+        ) as executor:
+            for cur_issue in repo_slice:
+                try:
+                    # a rate limited issue is mined again once the limit
+                    # lifts rather than being left out of the output
+                    cur_issue_data: dict = self.__retry_on_rate_limit(
+                        mine_issue, cur_issue, on_limit=write_out_data
+                    )
+
+                except (
+                    KeyboardInterrupt,
+                    github.GithubException,
+                    socket.error,
+                    socket.gaierror,
+                ):
+
+                    # the pool waits for running getters before exiting,
+                    # so tell them to stop after their current call
+                    self.stop_event.set()
+
+                    print("\nWriting gathered data...")
+                    utils.write_merged_dict_to_jsonfile(out_data, output_file)
+
+                    print(f"{TAB}Terminating at item #{cur_issue.number}\n")
+                    print("---------------------------------------------\n\n")
+                    traceback.print_exc()
+                    sys.exit(1)
+
+                else:
+                    out_data[str(cur_issue.number)] = cur_issue_data
+
+                    self.__print_progress(cur_issue.number)
 
-                print(f"{CLR}{TAB * 2}Issue: {cur_issue.number}, ", end="")
-                print(f"calls: {self.gh_sesh.get_remaining_calls()}", end="\r")
+        # the last issues mined may have been skipped by the throttle
+        if cur_issue is not None:
+            self.__print_progress(cur_issue.number, force=True)
 
         utils.write_merged_dict_to_jsonfile(out_data, output_file)
 
@@ -413,17 +657,16 @@ class Extractor:
 
         # dict will hold data related to all comments for an
         # issue. Issue to comments is a one to many relationship
-        comment_index: int = 0
         cur_comment_data: dict = {}
 
-        for comment in issue.get_comments():
-            cur_entry = self.__get_item_data(fields, cmd_tbl, comment)
-
-            cur_entry = {str(comment_index): cur_entry}
-
-            cur_comment_data |= cur_entry
+        for comment_index, comment in enumerate(issue.get_comments()):
+            # mining is being terminated and this data will be discarded
+            if self.stop_event.is_set():
+                break
 
-            comment_index += 1
+            cur_comment_data[str(comment_index)] = self.__get_item_data(
+                fields, cmd_tbl, comment
+            )
 
         return {field_type: cur_comment_data}
 
@@ -441,6 +684,12 @@ class Extractor:
 
         """
         def as_pr(cur_issue):
+            # the html_url of an issue that is also a PR points at
+            # ".../pull/<num>". It is part of the issue payload, so plain
+            # issues can be ruled out without a request that will 404
+            if "/pull/" not in cur_issue.html_url:
+                return None
+
             try:
                 cur_pr = cur_issue.as_pull_request()
 
@@ -464,10 +713,13 @@ class Extractor:
 
             """
             field_type: str = "commits"
-            commit_index: int = 0
             pr_commit_data: dict = {}
 
-            for commit in pr_obj.get_commits():
+            for commit_index, commit in enumerate(pr_obj.get_commits()):
+                # mining is being terminated and this data will be discarded
+                if self.stop_event.is_set():
+                    break
+
                 if commit.files:
                     commit_datum = self.__get_item_data(
                         fields, cmd_tbl, commit
@@ -476,9 +728,7 @@ class Extractor:
                 else:
                     commit_datum = {}
 
-                pr_commit_data |= {str(commit_index): commit_datum}
-
-                commit_index += 1
+                pr_commit_data[str(commit_index)] = commit_datum
 
             return {field_type: pr_commit_data}
 
@@ -538,7 +788,7 @@ class Extractor:
                 mid = (low + high) // 2
 
                 page, index = divmod(mid, page_len)
-                cur_val = self.paged_list.get_page(page)[index].number
+                cur_val = self.__get_page(page)[index].number
 
                 if val_to_find == cur_val:
                     return mid
@@ -553,17 +803,16 @@ class Extractor:
 
         print(f"{TAB}Finding range indices...")
 
-        while True:
-            try:
-                # We use two cores because we are only looking for two values
-                with futures.ThreadPoolExecutor(max_workers=2) as executor:
-                    results = executor.map(get_issue_index_by_num, val_range)
-
-            except github.RateLimitExceededException:
-                self.__sleep_extractor()
+        # We use two cores because we are only looking for two values.
+        # Each search retries on its own when rate limited
+        with futures.ThreadPoolExecutor(max_workers=2) as executor:
+            start_i, end_i = executor.map(
+                lambda num: self.__retry_on_rate_limit(
+                    get_issue_index_by_num, num
+                ),
+                val_range,
+            )
 
-            else:
-                start_i, end_i = [*results]
-                print(f"{TAB * 2}Indices found: {start_i} to {end_i}\n")
+        print(f"{TAB * 2}Indices found: {start_i} to {end_i}\n")
 
-                return (start_i, end_i)
+        return (start_i, end_i)
@@ -62,7 +62,9 @@ def _get_commit_files(commit_obj) -> dict:
         If a list of files is too large, it will be returned as
         a paginatied list. See note about the list length constraints
         at https://docs.github.com/en/rest/reference/commits#get-a-commit.
-        As of right now, this situation is not handled here.
+        As of right now, this situation is not handled here. The line
+        counts come from the commit's "stats", which cover every file
+        even when the file list is truncated.
 
     Args:
         commit_obj (github.Commit): commit to get file change data from
@@ -71,26 +73,21 @@ def _get_commit_files(commit_obj) -> dict:
         dict: dict of data about file changes made by the given PR
     """
     file_list = commit_obj.files
+    commit_stats = commit_obj.stats
 
     commit_files: list = []
     commit_patches: list = []
     commit_statuses: list = []
-    commit_adds: int = 0
-    commit_changes: int = 0
-    commit_deletions: int = 0
 
     for file in file_list:
         commit_files.append(file.filename)
         commit_patches.append(file.patch)
         commit_statuses.append(file.status)
-        commit_adds += int(file.additions)
-        commit_changes += int(file.changes)
-        commit_deletions += int(file.deletions)
 
     return {
-        "additions": commit_adds,
-        "deletions": commit_deletions,
-        "changes": commit_changes,
+        "additions": commit_stats.additions,
+        "deletions": commit_stats.deletions,
+        "changes": commit_stats.total,
         "file_list": commit_files,
         "status": commit_statuses,
         "patch_text": commit_patches,
@@ -5,14 +5,23 @@ Includes:
     - dictionary handling
     - file io
 
+JSON files whose path ends in ".gz" are transparently read and written
+as gzip-compressed text.
+
 json docs:
     https://docs.python.org/3/library/json.html
 """
 
+import gzip
 import json
 from json.decoder import JSONDecodeError
 import os
 import sys
+import zlib
+
+# json.dump hands the file object many small chunks; a large buffer
+# coalesces them into few write() syscalls, and reads into few read()s
+FILE_BUF_LEN = 1 << 20
 
 
 def write_merged_dict_to_jsonfile(out_dict: dict, out_path: str) -> None:
@@ -43,6 +52,11 @@ def read_jsonfile_into_dict(in_path: str) -> dict:
     """
     Read the contents of the provided JSON file into a dictionary.
 
+    A file which does not hold valid JSON, or a ".gz" file which is
+    truncated, corrupt or not gzip-compressed, is read as an empty
+    dict. Merging output into such a file therefore replaces it, and
+    anything that was still readable in it is lost.
+
     Args:
         in_path (str): path to JSON file to read from.
 
@@ -50,12 +64,18 @@ def read_jsonfile_into_dict(in_path: str) -> dict:
         dict: dictionary constructed from JSON contents.
     """
     try:
-        with open(in_path, "r", encoding="UTF-8") as file_obj:
+        with _open_json_file(in_path, "r") as file_obj:
             json_text = file_obj.read()
 
     except FileNotFoundError:
         json_text = ""
 
+    # a ".gz" file that was cut short, is corrupt or is not
+    # gzip-compressed holds no JSON we can read, the same as a plain
+    # file of invalid JSON
+    except (EOFError, gzip.BadGzipFile, zlib.error):
+        json_text = ""
+
     try:
         json_dict = json.loads(json_text)
 
@@ -65,6 +85,27 @@ def read_jsonfile_into_dict(in_path: str) -> dict:
     return json_dict
 
 
+def _open_json_file(path: str, mode: str):
+    """
+    Open a JSON file as text, compressing it if its name ends in ".gz".
+
+    Output made up of patch text compresses very well, so gzip at the
+    fastest compression level trades a little CPU for far fewer bytes
+    written to disk.
+
+    Args:
+        path (str): path to the file to open.
+        mode (str): "r" or "w".
+
+    Returns:
+        io.TextIOWrapper: text file object.
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, f"{mode}t", compresslevel=1, encoding="UTF-8")
+
+    return open(path, mode, buffering=FILE_BUF_LEN, encoding="UTF-8")
+
+
 def _merge_dicts_recursive(base_dict: dict, add_dict: dict) -> None:
     """
     Recursively merge two dictionaries.
@@ -97,7 +138,7 @@ def _merge_dicts_recursive(base_dict: dict, add_dict: dict) -> None:
 
 def _write_dict_to_jsonfile(out_dict: dict, out_path: str) -> None:
     """
-    Ensure output file exists and write Python dictionary to it as JSON.
+    Ensure output dir exists and write Python dictionary to it as JSON.
 
     Args:
         out_dict (dict): dictionary to write as JSON.
@@ -109,7 +150,7 @@ def _write_dict_to_jsonfile(out_dict: dict, out_path: str) -> None:
     mk_json_outpath(out_path)
 
     try:
-        with open(out_path, "w", encoding="UTF-8") as json_outfile:
+        with _open_json_file(out_path, "w") as json_outfile:
             json.dump(out_dict, json_outfile, ensure_ascii=False, indent=2)
 
     except FileNotFoundError:
@@ -117,40 +158,21 @@ def _write_dict_to_jsonfile(out_dict: dict, out_path: str) -> None:
         sys.exit(1)
 
 
-def mk_json_outpath(out_path: str):
+def mk_json_outpath(out_path: str) -> None:
     """
-    Create path to JSON file to write output data to.
+    Create the directories leading to a JSON output file.
 
     We cannot know if the user will always prepare output paths
     for us, so we must protect our operations by ensuring path
-    existence
+    existence. The file itself is created when it is opened for
+    writing.
 
     Args:
-        out_dir (str): dir to init output file in.
-
-    Raises:
-        FileExistsError: if the file that we are attempting to
-        create already exists, simply move on. The extractor
-        knows how to update already existing JSON outputs.
-
-    Returns:
-        str: path to output file
+        out_path (str): path to output file.
     """
     # ensures that path exists, no exception handling required
     os.makedirs(os.path.dirname(out_path), exist_ok=True)
 
-    # Using open() instead of mknode() allows this program to be portable;
-    # mknode appears to be *nix specific. We can use "x" mode to ensure that
-    # the open call is used exclusively for creating the file. If the file
-    # exists, though, "x" mode raises a FileExistsError, which we can
-    # ignore.
-    try:
-        with open(out_path, "x", encoding="UTF-8") as fptr:
-            fptr.close()
-
-    except FileExistsError:
-        pass
-
 
 def read_file_line(in_path: str) -> str:
     """
@@ -176,4 +198,4 @@ def read_file_line(in_path: str) -> str:
         sys.exit(1)
 
     else:
-        return file_text.strip().strip("\n")
+        return file_text.strip()